@@ -5,17 +5,28 @@ import asyncio
 import hashlib
 import logging
 import random
-from datetime import timedelta
+import time
+from collections import OrderedDict
+from functools import partial
+from datetime import datetime, timedelta
 from typing import Any
 
+from aiohttp import web
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
 
-from .api import SharePointPhotosApiClient
+from .api import Photo, SharePointPhotosApiClient, _detect_image_content_type
 from .const import (
     CONF_BASE_FOLDER_PATH,
     CONF_FOLDER_HISTORY_SIZE,
@@ -32,10 +43,53 @@ from .const import (
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.IMAGE]
 
+# Already entropy-coded formats (JPEG/WebP/...) gain nothing from Brotli;
+# these losslessly-compressed types typically shrink 10-30%.
+_BROTLI_TYPES = frozenset({"image/png", "image/svg+xml", "image/bmp", "image/tiff"})
+
 _LOGGER = logging.getLogger(__name__)
 
+# Error texts for the HTTP views, prebuilt so a flood of bad requests
+# spends nothing on string formatting even with logging filtered out.
+_ERR_INTEGRATION_NOT_FOUND = "Integration not found"
+_ERR_NO_PHOTOS = "No photos available"
+_ERR_INVALID_PHOTO_ID = "Invalid photo ID"
+_ERR_PHOTO_URL_UNAVAILABLE = "Photo URL not available"
+_ERR_FETCH_FAILED = "Failed to fetch image"
+_ERR_INTERNAL = "Internal server error"
+_ERR_CURRENT_UNAVAILABLE = "Current image not available"
+
 _DOMAIN_SERVICES_REGISTERED = "_services_registered"
+_PROXY_VIEW_REGISTERED = "_proxy_view_registered"
+_CURRENT_VIEW_REGISTERED = "_current_view_registered"
 _SETUP_LOCKS_KEY = "_setup_locks"
+_SERVICE_NAMES = ("refresh_photos", "select_folder", "refresh_token")
+
+# Empty column snapshot for payloads with no photos
+_EMPTY_ROT: dict[str, tuple] = {
+    "names": (),
+    "ids": (),
+    "web_urls": (),
+    "thumbs": (),
+    "proxies": (),
+    "downloads": (),
+}
+
+# Translation table for slugifying site URLs in one pass
+_SLUG_TABLE = str.maketrans("/", "_")
+
+# URL preference order for displaying a photo (proxy first)
+_PHOTO_URL_KEYS = ("proxy_url", "url", "thumbnail_url", "download_url", "web_url")
+
+
+def _select_photo_url(photo: Photo) -> str | None:
+    """Return the most reliable URL for a photo (proxy first)."""
+    for key in _PHOTO_URL_KEYS:
+        url = getattr(photo, key)
+        if url:
+            return url
+    return None
+
 _SETUP_DONE_PREFIX = "_setup_done_"
 _UPDATE_LISTENER_PREFIX = "_update_listener_"
 
@@ -66,18 +120,99 @@ class SharePointImageProxyView(HomeAssistantView):
     name = "api:sharepoint_photos:image"
     requires_auth = False  # We'll handle auth internally
 
+    # Shared LRU cache of raw image bytes keyed by SharePoint download URL.
+    # Dashboards request the same photo repeatedly (multiple tabs/devices),
+    # so serving repeats from RAM avoids a full Graph download each time.
+    _CACHE: OrderedDict[str, dict[str, Any]] = OrderedDict()
+    _CACHE_MAX_ENTRIES = 64
+    _CACHE_MAX_BYTES = 128 * 1024 * 1024
+    _CACHE_TTL_SECONDS = 3600
+    _cache_total_bytes = 0
+
     def __init__(self, hass: HomeAssistant):
         """Initialize the proxy view."""
         self.hass = hass
+        # Direct reference to the per-domain dict: saves two dict lookups
+        # (and a throwaway default dict) on every request.
+        self._entries = hass.data.setdefault(DOMAIN, {})
         # Cache last successful image bytes per entry/image key so transient
         # SharePoint URL expiry does not surface as broken media in dashboards.
         self._last_success: dict[str, dict[str, Any]] = {}
+        # Per-photo locks so concurrent first-time requests for the same
+        # photo trigger a single SharePoint fetch instead of N parallel
+        # ones. Keyed by the stable cache key (entry + image id), not the
+        # download URL: URLs carry rotating tokens and would grow the dict
+        # without bound, and the key population mirrors _last_success.
+        self._fetch_locks: dict[str, asyncio.Lock] = {}
 
     @staticmethod
     def _cache_key(entry_id: str, image_id: str) -> str:
         """Build the in-memory cache key for a proxied image."""
         return f"{entry_id}:{image_id}"
 
+    @classmethod
+    def _cache_get(cls, download_url: str) -> dict[str, Any] | None:
+        """Return a fresh cached entry for a download URL, or None.
+
+        Expired entries are kept around (subject to LRU eviction) so their
+        validators can be reused for a conditional re-fetch.
+        """
+        entry = cls._CACHE.get(download_url)
+        if entry is None:
+            return None
+
+        if time.monotonic() - entry["fetched_at"] >= cls._CACHE_TTL_SECONDS:
+            return None
+
+        cls._CACHE.move_to_end(download_url)
+        return entry
+
+    @staticmethod
+    def _client_cache_valid(request, etag: str) -> bool:
+        """Return True if the client's If-None-Match matches our ETag."""
+        return request is not None and request.headers.get("If-None-Match") == etag
+
+    def _build_not_modified_response(self, etag: str):
+        """Create a 304 response so the client reuses its own cached copy."""
+        return web.Response(
+            status=304,
+            headers={
+                "Cache-Control": "public, max-age=30, must-revalidate",
+                "ETag": etag,
+            },
+        )
+
+    @classmethod
+    def _cache_pop(cls, download_url: str) -> None:
+        """Remove one entry from the LRU cache."""
+        entry = cls._CACHE.pop(download_url, None)
+        if entry is not None:
+            cls._cache_total_bytes -= len(entry["content"])
+
+    @classmethod
+    def _cache_put(cls, download_url: str, entry: dict[str, Any]) -> None:
+        """Insert an entry and evict least-recently-used ones over budget."""
+        cls._cache_pop(download_url)
+        cls._CACHE[download_url] = entry
+        cls._cache_total_bytes += len(entry["content"])
+
+        while cls._CACHE and (
+            len(cls._CACHE) > cls._CACHE_MAX_ENTRIES
+            or cls._cache_total_bytes > cls._CACHE_MAX_BYTES
+        ):
+            evicted_url, evicted = cls._CACHE.popitem(last=False)
+            cls._cache_total_bytes -= len(evicted["content"])
+            _LOGGER.debug("Evicted cached image (%d bytes): %.100s", len(evicted["content"]), evicted_url)
+
+    @staticmethod
+    def _compute_etag(content: bytes) -> str:
+        """Return a strong ETag from a content hash.
+
+        BLAKE2b hashes a multi-MB photo in about a millisecond, far cheaper
+        than retransmitting it when the browser revalidates.
+        """
+        return '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"'
+
     @staticmethod
     def _normalize_content_type(content_type: str | None) -> str:
         """Return a browser-safe image content type."""
@@ -85,26 +220,144 @@ class SharePointImageProxyView(HomeAssistantView):
             return content_type
         return "image/jpeg"
 
+    async def _brotli_body(self, request, entry: dict[str, Any]) -> bytes | None:
+        """Return a Brotli-compressed body when the client accepts it.
+
+        Compression runs once per cached image and only for types where it
+        actually helps; the result is stored on the cache entry. The types
+        this fires for (PNG/BMP/TIFF) are multi-megabyte, so the compression
+        itself runs in the executor instead of stalling the event loop.
+        """
+        if brotli is None or entry["content_type"] not in _BROTLI_TYPES:
+            return None
+        if request is None or "br" not in request.headers.get("Accept-Encoding", ""):
+            return None
+
+        compressed = entry.get("br_content")
+        if compressed is None:
+            compressed = await self.hass.async_add_executor_job(
+                partial(brotli.compress, entry["content"], quality=4)
+            )
+            if len(compressed) >= len(entry["content"]):
+                # Not worth the Content-Encoding header; remember that.
+                compressed = b""
+            entry["br_content"] = compressed
+        return compressed or None
+
+    async def _serve_cache_entry(self, request, entry: dict[str, Any], include_body: bool = True):
+        """Build a response from a cache entry, compressed when beneficial."""
+        compressed = await self._brotli_body(request, entry)
+        if compressed is not None:
+            response = self._build_image_response(
+                compressed, entry["content_type"], entry["etag"], include_body=include_body
+            )
+            response.headers["Content-Encoding"] = "br"
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+
+        return self._build_image_response(
+            entry["content"], entry["content_type"], entry["etag"], include_body=include_body
+        )
+
     def _build_image_response(self, content: bytes, content_type: str, etag: str, include_body: bool = True):
         """Create a consistent HTTP response for image consumers."""
-        from aiohttp import web
-
         headers = {
             "Cache-Control": "public, max-age=30, must-revalidate",
-            "Content-Length": str(len(content)),
             "ETag": etag,
             "Access-Control-Allow-Origin": "*",
             "Content-Disposition": "inline",
         }
 
         if include_body:
+            # aiohttp derives Content-Length from the body and is free to
+            # negotiate the optimal transfer framing.
             return web.Response(body=content, content_type=content_type, headers=headers)
+
+        # HEAD responses have no body to measure, so advertise the size.
+        headers["Content-Length"] = str(len(content))
         return web.Response(status=200, content_type=content_type, headers=headers)
 
-    async def _proxy_image(self, entry_id: str, image_id: str, include_body: bool = True):
-        """Fetch and proxy a SharePoint image with stale-cache fallback."""
-        from aiohttp import web
+    async def _stream_image(self, request, cache_key: str, download_url: str, api_client):
+        """Stream an uncached image to the client while filling the cache.
 
+        Chunks are forwarded as they arrive, so time-to-first-byte is one
+        upstream RTT and peak memory stays at one chunk plus the cache copy.
+        Returns None when the caller should fall back to a buffered fetch.
+        """
+        status, content_type, upstream = await api_client.fetch_image_stream(download_url)
+        if status != 200 or upstream is None:
+            return None
+
+        try:
+            chunks = upstream.content.iter_chunked(65536)
+            try:
+                first_chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                first_chunk = b""
+
+            if not first_chunk:
+                _LOGGER.warning("Empty body on image stream, falling back to buffered fetch")
+                return None
+
+            # Sniff the first chunk so HTML error pages served with a 200
+            # are not streamed out as broken "images".
+            if not content_type.startswith("image/"):
+                inferred_type = _detect_image_content_type(first_chunk)
+                if inferred_type is None:
+                    _LOGGER.warning("Stream returned non-image payload, falling back to buffered fetch")
+                    return None
+                content_type = inferred_type
+
+            headers = {
+                "Cache-Control": "public, max-age=30, must-revalidate",
+                "Access-Control-Allow-Origin": "*",
+                "Content-Disposition": "inline",
+            }
+            content_length = upstream.headers.get("Content-Length")
+            if content_length:
+                headers["Content-Length"] = content_length
+
+            response = web.StreamResponse(status=200, headers=headers)
+            response.content_type = content_type
+
+            buffer = bytearray(first_chunk)
+            try:
+                await response.prepare(request)
+                await response.write(first_chunk)
+                async for chunk in chunks:
+                    buffer.extend(chunk)
+                    await response.write(chunk)
+                await response.write_eof()
+            except Exception as e:
+                # Headers are already on the wire; nothing to do but stop.
+                _LOGGER.warning("Streaming image aborted mid-transfer: %s", e)
+                return response
+        finally:
+            upstream.release()
+
+        content = bytes(buffer)
+        etag = self._compute_etag(content)
+        self._last_success[cache_key] = {
+            "content": content,
+            "content_type": content_type,
+            "etag": etag,
+        }
+        self._cache_put(
+            download_url,
+            {
+                "content": content,
+                "content_type": content_type,
+                "etag": etag,
+                "upstream_etag": upstream.headers.get("ETag"),
+                "upstream_last_modified": upstream.headers.get("Last-Modified"),
+                "fetched_at": time.monotonic(),
+            },
+        )
+        _LOGGER.debug("Streamed image to client: %d bytes, type: %s", len(content), content_type)
+        return response
+
+    async def _proxy_image(self, request, entry_id: str, image_id: str, include_body: bool = True):
+        """Fetch and proxy a SharePoint image with stale-cache fallback."""
         
         _LOGGER.debug("Proxy request received: entry_id=%s, image_id=%s", entry_id, image_id)
         cache_key = self._cache_key(entry_id, image_id)
@@ -112,24 +365,28 @@ class SharePointImageProxyView(HomeAssistantView):
         
         try:
             # Get the coordinator for this entry
-            coordinator = self.hass.data.get(DOMAIN, {}).get(entry_id)
+            coordinator = self._entries.get(entry_id)
             if not coordinator:
                 _LOGGER.error("Coordinator not found for entry_id: %s", entry_id)
-                return web.Response(status=404, text="Integration not found")
+                return web.Response(status=404, text=_ERR_INTEGRATION_NOT_FOUND)
             
             # Find the image in the current data
             data = coordinator.data
             if not data or not data.get("photos"):
                 _LOGGER.error("No photos available in coordinator data")
-                return web.Response(status=404, text="No photos available")
+                return web.Response(status=404, text=_ERR_NO_PHOTOS)
             
-            # Find the photo by ID (using index as ID)
+            # Find the photo by ID (using index as ID). Rejecting malformed
+            # IDs with str.isdigit avoids raising and unwinding a ValueError
+            # on the event loop when clients spam bad URLs; it also rules
+            # out negative indices.
+            if not image_id.isdigit():
+                _LOGGER.error("Invalid photo ID '%s'", image_id)
+                return web.Response(status=400, text=_ERR_INVALID_PHOTO_ID)
+
             try:
                 photo_index = int(image_id)
                 photos = data["photos"]
-                if photo_index < 0:
-                    _LOGGER.error("Negative photo index %d", photo_index)
-                    return web.Response(status=400, text="Invalid photo ID")
                 if photo_index >= len(photos):
                     original_index = photo_index
                     photo_index = photo_index % len(photos)
@@ -141,42 +398,96 @@ class SharePointImageProxyView(HomeAssistantView):
                     )
                 
                 photo = photos[photo_index]
-                download_url = photo.get("download_url")
+                download_url = photo.download_url
                 if not download_url:
                     _LOGGER.error("No download URL available for photo at index %d", photo_index)
-                    return web.Response(status=404, text="Photo URL not available")
+                    return web.Response(status=404, text=_ERR_PHOTO_URL_UNAVAILABLE)
                 
-                _LOGGER.debug("Fetching image from: %s", download_url[:100])
+                _LOGGER.debug("Fetching image from: %.100s", download_url)
                 
             except (ValueError, IndexError) as e:
-                _LOGGER.error("Invalid photo ID '%s': %s", image_id, str(e))
-                return web.Response(status=400, text="Invalid photo ID")
+                _LOGGER.error("Invalid photo ID '%s': %s", image_id, e)
+                return web.Response(status=400, text=_ERR_INVALID_PHOTO_ID)
             
+            cached = self._cache_get(download_url)
+            if cached is not None:
+                if self._client_cache_valid(request, cached["etag"]):
+                    return self._build_not_modified_response(cached["etag"])
+                _LOGGER.debug("Serving image from LRU cache: %.100s", download_url)
+                return await self._serve_cache_entry(request, cached, include_body=include_body)
+
             # Fetch the image from SharePoint using the API client
-            coordinator = self.hass.data[DOMAIN][entry_id]
-            api_client = coordinator._api_client
-            
-            content, content_type, status_code = await api_client.fetch_image_content(download_url)
-            
+            # (the coordinator resolved above already carries it).
+            api_client = coordinator.client
+
+            # Kick off a background token refresh when expiry is close so
+            # the next coordinator refresh never pays the 401-retry tax.
+            await api_client.async_refresh_token_if_needed()
+
+            fetch_lock = self._fetch_locks.setdefault(cache_key, asyncio.Lock())
+            async with fetch_lock:
+                # A concurrent request may have filled the cache while we waited.
+                cached = self._cache_get(download_url)
+                if cached is not None:
+                    return await self._serve_cache_entry(request, cached, include_body=include_body)
+
+                # An expired entry still carries SharePoint validators we can
+                # use for a conditional fetch (304 = no body transfer).
+                expired = self._CACHE.get(download_url)
+
+                # Cold miss with a real GET: stream the body through instead
+                # of buffering it twice. Failures fall back to the buffered
+                # path below, which owns the token-refresh retry logic.
+                if expired is None and include_body and request is not None:
+                    streamed = await self._stream_image(request, cache_key, download_url, api_client)
+                    if streamed is not None:
+                        return streamed
+
+
+                content, content_type, status_code, validators = await api_client.fetch_image_content(
+                    download_url,
+                    etag=expired.get("upstream_etag") if expired else None,
+                    last_modified=expired.get("upstream_last_modified") if expired else None,
+                )
+
+                if status_code == 304 and expired is not None:
+                    _LOGGER.debug("Upstream image unchanged (304), reviving cached bytes")
+                    expired["fetched_at"] = time.monotonic()
+                    if validators.get("etag"):
+                        expired["upstream_etag"] = validators["etag"]
+                    if validators.get("last_modified"):
+                        expired["upstream_last_modified"] = validators["last_modified"]
+                    self._CACHE.move_to_end(download_url)
+                    if self._client_cache_valid(request, expired["etag"]):
+                        return self._build_not_modified_response(expired["etag"])
+                    return await self._serve_cache_entry(request, expired, include_body=include_body)
+
             if status_code in (401, 403):
                 # Token expired, try to refresh the data and get new URLs
                 _LOGGER.info("Image URL expired (status=%d), refreshing photo data...", status_code)
-                await coordinator.async_request_refresh()
+                await coordinator.coalesced_refresh()
                 
                 # Get updated data
                 updated_data = coordinator.data
                 if updated_data and updated_data.get("photos"):
                     updated_photos = updated_data["photos"]
-                    # Try to find a photo with the same name first
-                    original_photo_name = photo.get("name", "")
+                    original_photo_name = photo.name
                     updated_photo = None
-                    
-                    # First, try to find the same photo by name
-                    for up in updated_photos:
-                        if up.get("name") == original_photo_name:
-                            updated_photo = up
+
+                    # Common case first: the folder is unchanged and only the
+                    # URLs rotated, so the same index still holds our photo.
+                    if (
+                        photo_index < len(updated_photos)
+                        and updated_photos[photo_index].name == original_photo_name
+                    ):
+                        updated_photo = updated_photos[photo_index]
+                        _LOGGER.debug("Photo unchanged at index %d", photo_index)
+
+                    # Folder contents shifted: look the photo up by name
+                    if not updated_photo:
+                        updated_photo = updated_data.get("_by_name", {}).get(original_photo_name)
+                        if updated_photo:
                             _LOGGER.debug("Found same photo by name: %s", original_photo_name)
-                            break
                     
                     # If not found by name, try the same index if it exists
                     if not updated_photo and photo_index < len(updated_photos):
@@ -189,10 +500,10 @@ class SharePointImageProxyView(HomeAssistantView):
                         _LOGGER.debug("Using first photo as fallback")
                     
                     if updated_photo:
-                        updated_download_url = updated_photo.get("download_url")
+                        updated_download_url = updated_photo.download_url
                         if updated_download_url and updated_download_url != download_url:
                             _LOGGER.debug("Retrying with refreshed URL")
-                            content, content_type, status_code = await api_client.fetch_image_content(updated_download_url)
+                            content, content_type, status_code, validators = await api_client.fetch_image_content(updated_download_url)
                         else:
                             _LOGGER.warning("Refreshed photo has same download URL, token refresh may have failed")
                     else:
@@ -202,14 +513,25 @@ class SharePointImageProxyView(HomeAssistantView):
                 
             if status_code == 200 and content:
                 normalized_content_type = self._normalize_content_type(content_type)
-                etag = hashlib.md5(content).hexdigest()  # nosec - weak hash is fine for cache validation
+                etag = self._compute_etag(content)
                 self._last_success[cache_key] = {
                     "content": content,
                     "content_type": normalized_content_type,
                     "etag": etag,
                 }
+                entry = {
+                    "content": content,
+                    "content_type": normalized_content_type,
+                    "etag": etag,
+                    "upstream_etag": validators.get("etag"),
+                    "upstream_last_modified": validators.get("last_modified"),
+                    "fetched_at": time.monotonic(),
+                }
+                self._cache_put(download_url, entry)
+                if self._client_cache_valid(request, etag):
+                    return self._build_not_modified_response(etag)
                 _LOGGER.debug("Successfully proxied image: %d bytes, type: %s", len(content), normalized_content_type)
-                return self._build_image_response(content, normalized_content_type, etag, include_body=include_body)
+                return await self._serve_cache_entry(request, entry, include_body=include_body)
 
             if stale:
                 _LOGGER.warning(
@@ -227,10 +549,10 @@ class SharePointImageProxyView(HomeAssistantView):
 
             else:
                 _LOGGER.error("Failed to fetch image from SharePoint: HTTP %d", status_code)
-                return web.Response(status=status_code if status_code else 500, text="Failed to fetch image")
+                return web.Response(status=status_code if status_code else 500, text=_ERR_FETCH_FAILED)
                         
         except Exception as e:
-            _LOGGER.error("Error proxying SharePoint image: %s", str(e))
+            _LOGGER.error("Error proxying SharePoint image: %s", e)
             if stale:
                 response = self._build_image_response(
                     stale["content"],
@@ -240,15 +562,15 @@ class SharePointImageProxyView(HomeAssistantView):
                 )
                 response.headers["X-SharePoint-Proxy"] = "stale-cache-exception"
                 return response
-            return web.Response(status=500, text="Internal server error")
+            return web.Response(status=500, text=_ERR_INTERNAL)
 
     async def get(self, request, entry_id: str, image_id: str):
         """Proxy SharePoint image requests."""
-        return await self._proxy_image(entry_id, image_id, include_body=True)
+        return await self._proxy_image(request, entry_id, image_id, include_body=True)
 
     async def head(self, request, entry_id: str, image_id: str):
         """Handle HEAD requests for image metadata compatibility."""
-        return await self._proxy_image(entry_id, image_id, include_body=False)
+        return await self._proxy_image(request, entry_id, image_id, include_body=False)
 
 
 class SharePointCurrentImageView(HomeAssistantView):
@@ -261,18 +583,17 @@ class SharePointCurrentImageView(HomeAssistantView):
     def __init__(self, hass: HomeAssistant):
         """Initialize the current-image view."""
         self.hass = hass
+        self._entries = hass.data.setdefault(DOMAIN, {})
 
     async def _handle(self, entry_id: str, include_body: bool = True):
         """Return the current cached image."""
-        from aiohttp import web
-
-        coordinator = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        coordinator = self._entries.get(entry_id)
         if not coordinator:
-            return web.Response(status=404, text="Integration not found")
+            return web.Response(status=404, text=_ERR_INTEGRATION_NOT_FOUND)
 
         content, content_type = await coordinator.async_get_or_load_current_image()
         if not content:
-            return web.Response(status=503, text="Current image not available")
+            return web.Response(status=503, text=_ERR_CURRENT_UNAVAILABLE)
 
         response_headers = {
             "Cache-Control": "no-store",
@@ -348,6 +669,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             base_folder_path=base_folder_path,
             recent_history_size=recent_history_size,
             min_photos_per_folder=min_photos_per_folder,
+            entry_id=entry.entry_id,
         )
 
         coordinator = SharePointPhotosDataUpdateCoordinator(
@@ -375,15 +697,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         hass.async_create_task(_deferred_first_refresh())
 
-        # Register the image proxy view (only if not already registered)
-        if not hasattr(hass.http, '_sharepoint_photos_proxy_registered'):
+        # Register the HTTP views once per Home Assistant instance. The
+        # check-and-set runs without awaits on the event loop, so a sentinel
+        # in our own domain data is race-free and survives entry reloads.
+        if not domain_data.get(_PROXY_VIEW_REGISTERED):
             hass.http.register_view(SharePointImageProxyView(hass))
-            hass.http._sharepoint_photos_proxy_registered = True
+            domain_data[_PROXY_VIEW_REGISTERED] = True
             _LOGGER.debug("Registered SharePoint Photos image proxy view")
 
-        if not hasattr(hass.http, '_sharepoint_photos_current_view_registered'):
+        if not domain_data.get(_CURRENT_VIEW_REGISTERED):
             hass.http.register_view(SharePointCurrentImageView(hass))
-            hass.http._sharepoint_photos_current_view_registered = True
+            domain_data[_CURRENT_VIEW_REGISTERED] = True
             _LOGGER.debug("Registered SharePoint Photos current image view")
 
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -442,12 +766,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 # Refresh current folder data (don't change folders)
                 await target.async_request_refresh()
 
-            if not hass.services.has_service(DOMAIN, "refresh_photos"):
-                hass.services.async_register(DOMAIN, "refresh_photos", handle_refresh_photos)
-            if not hass.services.has_service(DOMAIN, "select_folder"):
-                hass.services.async_register(DOMAIN, "select_folder", handle_select_folder)
-            if not hass.services.has_service(DOMAIN, "refresh_token"):
-                hass.services.async_register(DOMAIN, "refresh_token", handle_refresh_token)
+            handlers = (handle_refresh_photos, handle_select_folder, handle_refresh_token)
+            for service_name, handler in zip(_SERVICE_NAMES, handlers):
+                if not hass.services.has_service(DOMAIN, service_name):
+                    hass.services.async_register(DOMAIN, service_name, handler)
 
             domain_data[_DOMAIN_SERVICES_REGISTERED] = True
 
@@ -469,16 +791,21 @@ class SharePointPhotosDataUpdateCoordinator(DataUpdateCoordinator):
     ) -> None:
         """Initialize."""
         self.client = client
-        self._api_client = client  # Also store as _api_client for the proxy view
         self.entry_id = entry_id
+        # Site-derived slug used by every entity's unique_id; computed once
+        # here instead of per entity constructor.
+        self.site_slug = (client.site_url or "").removeprefix("https://").translate(_SLUG_TABLE)
         self.rotation_interval_seconds = max(5, int(rotation_interval_seconds or DEFAULT_ROTATION_INTERVAL_SECONDS))
         self._current_photo_index: int | None = None
         self._current_photo_name: str | None = None
         self._current_image_bytes: bytes | None = None
         self._current_image_type: str = "image/jpeg"
+        # When the displayed photo last changed; drives image_last_updated
+        self.last_rotation: datetime | None = None
         self._image_lock = asyncio.Lock()
         self._rotation_unsub = None
         self._rotation_task: asyncio.Task | None = None
+        self._refresh_in_flight: asyncio.Task | None = None
         super().__init__(
             hass=hass,
             logger=_LOGGER,
@@ -486,10 +813,31 @@ class SharePointPhotosDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=None,  # Disable automatic updates - only manual refresh
         )
 
+    async def coalesced_refresh(self) -> None:
+        """Share one in-flight refresh among concurrent callers.
+
+        When a token expires, every in-flight proxy request sees a 401 at
+        once; without coalescing each of them would trigger its own folder
+        listing and token grant against SharePoint.
+        """
+        if self._refresh_in_flight is not None:
+            await self._refresh_in_flight
+            return
+
+        task = self.hass.async_create_task(self.async_request_refresh())
+        self._refresh_in_flight = task
+        try:
+            await task
+        finally:
+            self._refresh_in_flight = None
+
     def build_initial_state(self) -> dict[str, Any]:
         """Return initial empty state with stable current-image URL."""
         return {
             "photos": [],
+            "_by_name": {},
+            "photo_urls": (),
+            "rot": _EMPTY_ROT,
             "photo_count": 0,
             "current_proxy_url": f"/api/sharepoint_photos/current/{self.entry_id}",
             "rotation_interval_seconds": self.rotation_interval_seconds,
@@ -497,16 +845,25 @@ class SharePointPhotosDataUpdateCoordinator(DataUpdateCoordinator):
             "current_photo_name": None,
         }
 
-    def _apply_proxy_urls(self, data: dict[str, Any]) -> None:
-        """Inject entry ID into per-photo proxy URLs."""
-        photos = data.get("photos", [])
-        for photo in photos:
-            if "proxy_url" in photo:
-                photo["proxy_url"] = photo["proxy_url"].replace("{entry_id}", self.entry_id)
-
     def _build_state_payload(self, data: dict[str, Any]) -> dict[str, Any]:
         """Attach current-image metadata to coordinator payload."""
         payload = dict(data)
+        # Resolve display URLs once per refresh; sensors index this tuple on
+        # every state read instead of re-scanning the photo dicts.
+        photos = payload.get("photos", [])
+        payload["photo_urls"] = tuple(
+            url for photo in photos if (url := _select_photo_url(photo))
+        )
+        # Column-wise snapshot of the per-photo fields the sensors surface;
+        # attribute reads index these tuples instead of walking photo dicts.
+        payload["rot"] = {
+            "names": tuple(photo.name for photo in photos),
+            "ids": tuple(photo.id for photo in photos),
+            "web_urls": tuple(photo.web_url for photo in photos),
+            "thumbs": tuple(photo.thumbnail_url for photo in photos),
+            "proxies": tuple(photo.proxy_url for photo in photos),
+            "downloads": tuple(photo.download_url for photo in photos),
+        } if photos else _EMPTY_ROT
         payload["current_proxy_url"] = f"/api/sharepoint_photos/current/{self.entry_id}"
         payload["rotation_interval_seconds"] = self.rotation_interval_seconds
         payload["photo_count"] = len(payload.get("photos", []))
@@ -514,7 +871,7 @@ class SharePointPhotosDataUpdateCoordinator(DataUpdateCoordinator):
         payload["current_photo_name"] = self._current_photo_name
         return payload
 
-    async def _try_swap_current_photo(self, photos: list[dict[str, Any]], force: bool = False) -> bool:
+    async def _try_swap_current_photo(self, photos: list[Photo], force: bool = False) -> bool:
         """Fetch a new random photo and atomically swap cache on success."""
         if not photos:
             return False
@@ -527,17 +884,18 @@ class SharePointPhotosDataUpdateCoordinator(DataUpdateCoordinator):
         max_attempts = min(3, len(indices))
         for idx in indices[:max_attempts]:
             candidate = photos[idx]
-            download_url = candidate.get("download_url")
+            download_url = candidate.download_url
             if not download_url:
                 continue
 
-            content, content_type, status_code = await self._api_client.fetch_image_content(download_url)
+            content, content_type, status_code, _ = await self.client.fetch_image_content(download_url)
             if status_code == 200 and content:
                 self._current_image_bytes = content
                 if content_type:
                     self._current_image_type = content_type
                 self._current_photo_index = idx
-                self._current_photo_name = candidate.get("name")
+                self._current_photo_name = candidate.name
+                self.last_rotation = dt_util.utcnow()
                 _LOGGER.debug(
                     "Swapped current photo (index=%s, name=%s, bytes=%d)",
                     self._current_photo_index,
@@ -549,7 +907,7 @@ class SharePointPhotosDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.debug(
                 "Candidate photo fetch failed (index=%s, name=%s, status=%s)",
                 idx,
-                candidate.get("name"),
+                candidate.name,
                 status_code,
             )
 
@@ -628,8 +986,7 @@ class SharePointPhotosDataUpdateCoordinator(DataUpdateCoordinator):
             
             if data and data.get("photos"):
                 _LOGGER.info("Found %d photos in folder '%s'", len(data["photos"]), data.get("folder_name", "unknown"))
-                self._apply_proxy_urls(data)
-                _LOGGER.debug("Updated proxy URLs for all photos")
+                data["_by_name"] = {photo.name: photo for photo in data["photos"]}
                 await self._try_swap_current_photo(data["photos"], force=True)
             else:
                 _LOGGER.warning("No photos found in data update")
@@ -639,9 +996,7 @@ class SharePointPhotosDataUpdateCoordinator(DataUpdateCoordinator):
 
             return self._build_state_payload(data)
         except Exception as exception:
-            _LOGGER.error("Error during data update: %s", str(exception))
-            import traceback
-            _LOGGER.error("Traceback: %s", traceback.format_exc())
+            _LOGGER.exception("Error during data update")
             raise UpdateFailed() from exception
 
     async def async_refresh_new_folder(self):
@@ -651,7 +1006,7 @@ class SharePointPhotosDataUpdateCoordinator(DataUpdateCoordinator):
             data = await self.client.async_get_random_folder_photos(force_new_folder=True)
             
             if data and data.get("photos"):
-                self._apply_proxy_urls(data)
+                data["_by_name"] = {photo.name: photo for photo in data["photos"]}
                 await self._try_swap_current_photo(data["photos"], force=True)
                 
                 self.async_set_updated_data(self._build_state_payload(data))
@@ -662,7 +1017,7 @@ class SharePointPhotosDataUpdateCoordinator(DataUpdateCoordinator):
                 _LOGGER.warning("No photos found when refreshing to new folder")
                 return None
         except Exception as exception:
-            _LOGGER.error("Error refreshing to new folder: %s", str(exception))
+            _LOGGER.error("Error refreshing to new folder: %s", exception)
             return None
 
 
@@ -680,6 +1035,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         unloaded = True
 
     if unloaded:
+        # Only release the client's session once the platforms are really
+        # gone; a failed unload keeps the coordinator (and its session) live.
+        if coordinator:
+            await coordinator.client.async_close()
+
         domain_data = hass.data.get(DOMAIN, {})
         domain_data.pop(entry.entry_id, None)
 
@@ -693,12 +1053,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         setup_locks.pop(entry.entry_id, None)
 
         if not _iter_entry_ids(domain_data):
-            if hass.services.has_service(DOMAIN, "refresh_photos"):
-                hass.services.async_remove(DOMAIN, "refresh_photos")
-            if hass.services.has_service(DOMAIN, "select_folder"):
-                hass.services.async_remove(DOMAIN, "select_folder")
-            if hass.services.has_service(DOMAIN, "refresh_token"):
-                hass.services.async_remove(DOMAIN, "refresh_token")
+            for service_name in _SERVICE_NAMES:
+                if hass.services.has_service(DOMAIN, service_name):
+                    hass.services.async_remove(DOMAIN, service_name)
             domain_data[_DOMAIN_SERVICES_REGISTERED] = False
 
     return unloaded
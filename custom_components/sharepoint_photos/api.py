@@ -1,16 +1,18 @@
 """SharePoint API client for Home Assistant integration."""
 
+import asyncio
 import logging
 import random
 from collections import deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional
 
 import aiohttp
-import msal
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
 from .const import (
     AUTHORITY_BASE,
@@ -19,13 +21,36 @@ from .const import (
     CONF_TENANT_ID,
     DEFAULT_FOLDER_HISTORY_SIZE,
     DEFAULT_MIN_PHOTO_COUNT,
+    DOMAIN,
     GRAPH_API_BASE,
-    IMAGE_EXTENSIONS,
-    SCOPE,
+    GRAPH_BATCH_SIZE,
+    IMAGE_EXTENSIONS_TUPLE,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Thumbnail sizes in order of display preference
+_THUMB_PREFERENCE = ("large", "medium", "small")
+
+
+class Photo(NamedTuple):
+    """Compact immutable record for one photo in the current folder.
+
+    Attribute access is a C-level offset read, and the record is far
+    lighter than the per-photo dicts it replaced on the rotation path.
+    """
+
+    id: Optional[str]
+    name: str
+    url: str
+    proxy_url: str
+    thumbnail_url: Optional[str]
+    download_url: str
+    web_url: Optional[str]
+    size: int
+    modified: Optional[str]
+    index: int
+
 
 def _detect_image_content_type(content: bytes) -> str | None:
     """Infer image mime type from magic bytes when headers are unreliable."""
@@ -47,6 +72,19 @@ def _detect_image_content_type(content: bytes) -> str | None:
 class SharePointPhotosApiClient:
     """Client for interacting with SharePoint via Microsoft Graph API."""
 
+    # Refresh tokens this close to expiry (~5% of the usual 1h lifetime).
+    TOKEN_REFRESH_MARGIN = timedelta(minutes=3)
+
+    # Storage schema version for the persisted access token
+    TOKEN_STORE_VERSION = 1
+
+    # Storage schema version for the persisted site/drive IDs
+    IDS_STORE_VERSION = 1
+
+    # Retry policy for the token endpoint (transient failures only)
+    AUTH_MAX_ATTEMPTS = 3
+    AUTH_BACKOFF_BASE = 0.5
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -58,24 +96,67 @@ class SharePointPhotosApiClient:
         base_folder_path: str = "/Photos",
         recent_history_size: int = DEFAULT_FOLDER_HISTORY_SIZE,
         min_photos_per_folder: int = DEFAULT_MIN_PHOTO_COUNT,
+        entry_id: Optional[str] = None,
     ) -> None:
         """Initialize the SharePoint client."""
         self.hass = hass
+        self.entry_id = entry_id
+        # With a known config entry the final proxy URL can be emitted
+        # directly; config-flow validation clients keep the placeholder.
+        self._proxy_url_prefix = (
+            f"/api/sharepoint_photos/image/{entry_id}"
+            if entry_id
+            else "/api/sharepoint_photos/image/{entry_id}"
+        )
         self.tenant_id = tenant_id
         self.client_id = client_id
         self.client_secret = client_secret
         self.site_url = site_url
         self.library_name = library_name
         self.base_folder_path = base_folder_path
+        # The base path never changes after construction; pre-split it so
+        # _build_display_folder_name does not redo this per scanned folder.
+        self._base_parts = tuple(p for p in (base_folder_path or "").strip("/").split("/") if p)
+        self._base_len = len(self._base_parts)
         self._recent_history_size = max(0, recent_history_size or 0)
         self._min_photos_per_folder = max(1, min_photos_per_folder or DEFAULT_MIN_PHOTO_COUNT)
         self._recent_folder_paths = (
             deque(maxlen=self._recent_history_size) if self._recent_history_size > 0 else None
         )
+        # Mirrors the deque for O(1) membership checks
+        self._recent_folder_set: set = set()
         
-        self._session = async_get_clientsession(hass)
+        # Entry-bound clients own a dedicated session with keep-alive tuned
+        # for Graph: connection reuse avoids a fresh TLS handshake on every
+        # scan/batch call, and the per-host limit matches the bounded scan
+        # concurrency. HA's session helpers do not accept a custom connector
+        # (and neuter close()), so the session is created and closed here.
+        # Config-flow validation clients are short-lived and just borrow
+        # HA's shared session, so repeated flow attempts leak nothing.
+        self._owns_session = entry_id is not None
+        if self._owns_session:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=16,
+                    limit_per_host=16,
+                    keepalive_timeout=75,
+                    ttl_dns_cache=300,
+                ),
+            )
+        else:
+            self._session = async_get_clientsession(hass)
         self._access_token: Optional[str] = None
         self._token_expires: Optional[datetime] = None
+        self._refresh_lock = asyncio.Lock()
+        self._scan_sem = asyncio.Semaphore(8)
+        self._token_store: Optional[Store] = (
+            Store(hass, self.TOKEN_STORE_VERSION, f"{DOMAIN}_token_{entry_id}") if entry_id else None
+        )
+        self._token_store_checked = False
+        self._ids_store: Optional[Store] = (
+            Store(hass, self.IDS_STORE_VERSION, f"{DOMAIN}_ids_{entry_id}") if entry_id else None
+        )
+        self._ids_store_checked = False
         self._site_id: Optional[str] = None
         self._drive_id: Optional[str] = None
         
@@ -93,28 +174,24 @@ class SharePointPhotosApiClient:
             return ""
 
         normalized_path = folder_path.strip("/")
-        normalized_base = (self.base_folder_path or "").strip("/")
-
         if not normalized_path:
             return ""
 
-        if normalized_base:
+        if self._base_parts:
             path_parts = normalized_path.split("/")
-            base_parts = normalized_base.split("/")
-
-            if path_parts[: len(base_parts)] == base_parts:
-                relative_parts = path_parts[len(base_parts) :]
+            if tuple(path_parts[: self._base_len]) == self._base_parts:
+                relative_parts = path_parts[self._base_len :]
                 if relative_parts:
                     return "/".join(relative_parts)
 
-        return normalized_path.split("/")[-1]
+        return normalized_path.rsplit("/", 1)[-1]
 
     def _filter_recent_folders(self, folders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter out recently used folders when enough choices are available."""
         if not folders or not self._recent_folder_paths:
             return folders
 
-        recent_paths = set(self._recent_folder_paths)
+        recent_paths = self._recent_folder_set
         available = [folder for folder in folders if folder.get("path") not in recent_paths]
 
         if available:
@@ -138,12 +215,14 @@ class SharePointPhotosApiClient:
         if not folder_path or not self._recent_folder_paths:
             return
 
-        try:
+        if folder_path in self._recent_folder_set:
             self._recent_folder_paths.remove(folder_path)
-        except ValueError:
-            pass
+        elif len(self._recent_folder_paths) == self._recent_folder_paths.maxlen:
+            # The deque is about to evict its oldest entry; keep the set in sync.
+            self._recent_folder_set.discard(self._recent_folder_paths[0])
 
         self._recent_folder_paths.append(folder_path)
+        self._recent_folder_set.add(folder_path)
         _LOGGER.debug(
             "Recent folder history updated (%d/%d): %s",
             len(self._recent_folder_paths),
@@ -167,7 +246,7 @@ class SharePointPhotosApiClient:
             for index, path in enumerate(ordered_paths)
         ]
 
-    def _build_folder_payload(self, folder_path: str, photos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _build_folder_payload(self, folder_path: str, photos: List[Photo]) -> Dict[str, Any]:
         """Create the coordinator payload that sensors consume."""
         return {
             "folder_name": self._build_display_folder_name(folder_path),
@@ -178,101 +257,160 @@ class SharePointPhotosApiClient:
             "recent_folders": self._get_recent_folder_history(),
         }
 
+    async def async_close(self) -> None:
+        """Release the dedicated HTTP session and its connection pool."""
+        if self._owns_session:
+            await self._session.close()
+
     async def authenticate(self) -> bool:
         """Authenticate with Microsoft Graph API."""
         try:
-            # Try direct HTTP authentication first (to avoid MSAL blocking issues)
-            if await self._authenticate_direct():
-                return True
-            
-            # Fallback to MSAL if direct method fails
-            return await self._authenticate_msal()
-                
+            return await self._authenticate_direct()
         except Exception as e:
             _LOGGER.error("Authentication error: %s", str(e))
             return False
 
     async def _authenticate_direct(self) -> bool:
-        """Authenticate using direct HTTP requests to avoid MSAL blocking."""
-        try:
-            _LOGGER.info("Attempting direct HTTP authentication")
-            
-            url = f"{AUTHORITY_BASE}/{self.tenant_id}/oauth2/v2.0/token"
-            
-            data = {
-                'client_id': self.client_id,
-                'client_secret': self.client_secret,
-                'scope': 'https://graph.microsoft.com/.default',
-                'grant_type': 'client_credentials'
-            }
-            
-            headers = {
-                'Content-Type': 'application/x-www-form-urlencoded'
-            }
-            
-            async with self._session.post(url, data=data, headers=headers) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    if "access_token" in result:
-                        self._access_token = result["access_token"]
-                        self._token_expires = dt_util.utcnow() + timedelta(seconds=result.get("expires_in", 3600) - 60)
-                        _LOGGER.info("Successfully authenticated with direct HTTP method")
-                        return True
-                else:
+        """Authenticate against the token endpoint with aiohttp.
+
+        Transient failures (429 and 5xx) are retried with exponential
+        backoff plus jitter; credential errors fail immediately.
+        """
+        url = f"{AUTHORITY_BASE}/{self.tenant_id}/oauth2/v2.0/token"
+
+        data = {
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'scope': 'https://graph.microsoft.com/.default',
+            'grant_type': 'client_credentials'
+        }
+
+        headers = {
+            'Content-Type': 'application/x-www-form-urlencoded'
+        }
+
+        for attempt in range(self.AUTH_MAX_ATTEMPTS):
+            if attempt:
+                delay = self.AUTH_BACKOFF_BASE * (2 ** (attempt - 1)) + random.uniform(0, 0.3)
+                _LOGGER.debug("Retrying authentication in %.2fs (attempt %d)", delay, attempt + 1)
+                await asyncio.sleep(delay)
+
+            try:
+                async with self._session.post(url, data=data, headers=headers) as response:
+                    if response.status == 200:
+                        result = await response.json(loads=json_loads)
+                        if "access_token" in result:
+                            self._access_token = result["access_token"]
+                            self._token_expires = dt_util.utcnow() + timedelta(seconds=result.get("expires_in", 3600) - 60)
+                            _LOGGER.info("Successfully authenticated with Microsoft Graph API")
+                            await self._async_save_token()
+                            return True
+                        return False
+
                     error_text = await response.text()
-                    _LOGGER.warning("Direct HTTP authentication failed: %s - %s", response.status, error_text)
+                    if response.status == 429 or response.status >= 500:
+                        _LOGGER.warning("Transient authentication failure: %s - %.200s", response.status, error_text)
+                        continue
+
+                    _LOGGER.warning("Authentication failed: %s - %.200s", response.status, error_text)
                     return False
-                    
-        except Exception as e:
-            _LOGGER.warning("Direct HTTP authentication error: %s", str(e))
-            return False
 
-    async def _authenticate_msal(self) -> bool:
-        """Authenticate using MSAL library (fallback method)."""
+            except aiohttp.ClientError as e:
+                _LOGGER.warning("Authentication request error: %s", e)
+                continue
+
+        return False
+
+    async def async_refresh_token_if_needed(self) -> None:
+        """Refresh the access token shortly before it expires.
+
+        While the token is merely close to expiry the refresh runs as a
+        background task and callers keep using the current token; only a
+        token that is already expired blocks the caller. This removes the
+        reactive 401-and-retry latency from user-visible requests.
+        """
+        if not self._access_token or self._token_expires is None:
+            return
+
+        remaining = self._token_expires - dt_util.utcnow()
+        if remaining > self.TOKEN_REFRESH_MARGIN:
+            return
+
+        if remaining.total_seconds() <= 0:
+            await self._refresh_token_guarded()
+            return
+
+        if not self._refresh_lock.locked():
+            self.hass.async_create_task(self._refresh_token_guarded())
+
+    async def _refresh_token_guarded(self) -> None:
+        """Run one token refresh at a time; extra callers become no-ops."""
+        async with self._refresh_lock:
+            if self._token_expires and self._token_expires - dt_util.utcnow() > self.TOKEN_REFRESH_MARGIN:
+                return
+            await self.authenticate()
+
+    async def _async_load_stored_token(self) -> None:
+        """Adopt a still-valid access token persisted by a previous run.
+
+        Tokens live for about an hour, so a Home Assistant restart usually
+        happens well within a token's lifetime; reusing it skips one
+        blocking token-endpoint POST on every startup.
+        """
+        self._token_store_checked = True
+        if self._token_store is None:
+            return
+
         try:
-            authority = f"{AUTHORITY_BASE}/{self.tenant_id}"
-            _LOGGER.info("Attempting MSAL authentication with authority: %s", authority)
-            _LOGGER.info("Client ID: %s", self.client_id[:8] + "..." if len(self.client_id) > 8 else "short")
-            _LOGGER.info("Tenant ID: %s", self.tenant_id[:8] + "..." if len(self.tenant_id) > 8 else "short")
-            
-            # Run MSAL in executor to avoid blocking the event loop
-            def _get_token():
-                app = msal.ConfidentialClientApplication(
-                    self.client_id,
-                    authority=authority,
-                    client_credential=self.client_secret,
-                )
-                return app.acquire_token_for_client(scopes=SCOPE)
-            
-            # Execute the blocking MSAL call in a thread pool
-            result = await self.hass.async_add_executor_job(_get_token)
-            _LOGGER.info("MSAL result keys: %s", list(result.keys()))
-            
-            if "access_token" in result:
-                self._access_token = result["access_token"]
-                # Token typically expires in 1 hour
-                self._token_expires = dt_util.utcnow() + timedelta(seconds=result.get("expires_in", 3600) - 60)
-                _LOGGER.info("Successfully authenticated with Microsoft Graph API using MSAL")
-                return True
-            else:
-                _LOGGER.error("MSAL authentication failed - result: %s", {k: v for k, v in result.items() if k != "access_token"})
-                if "error" in result:
-                    _LOGGER.error("Error: %s", result.get("error"))
-                if "error_description" in result:
-                    _LOGGER.error("Error description: %s", result.get("error_description"))
-                if "correlation_id" in result:
-                    _LOGGER.error("Correlation ID: %s", result.get("correlation_id"))
-                return False
-                
-        except Exception as e:
-            _LOGGER.error("MSAL authentication error: %s", str(e))
+            data = await self._token_store.async_load()
+        except Exception:
+            _LOGGER.exception("Failed to load stored access token")
+            return
+
+        if not data:
+            return
+
+        expires = dt_util.parse_datetime(data.get("expires") or "")
+        if expires and expires > dt_util.utcnow():
+            self._access_token = data.get("access_token")
+            self._token_expires = expires
+            _LOGGER.debug("Reusing stored access token (expires %s)", expires)
+
+    async def _async_save_token(self) -> None:
+        """Persist the current access token for reuse across restarts."""
+        if self._token_store is None or not self._access_token:
+            return
+
+        try:
+            await self._token_store.async_save(
+                {
+                    "access_token": self._access_token,
+                    "expires": self._token_expires.isoformat() if self._token_expires else None,
+                }
+            )
+        except Exception:
+            _LOGGER.exception("Failed to persist access token")
+
+    def _token_valid(self) -> bool:
+        """Return True while the current access token is usable."""
+        if not self._access_token:
             return False
+        return not (self._token_expires and dt_util.utcnow() >= self._token_expires)
 
     async def _ensure_authenticated(self) -> bool:
         """Ensure we have a valid access token."""
-        if not self._access_token or (self._token_expires and dt_util.utcnow() >= self._token_expires):
+        if self._access_token is None and not self._token_store_checked:
+            await self._async_load_stored_token()
+
+        if self._token_valid():
+            return True
+
+        # Coalesce concurrent refreshes: the first caller performs the token
+        # POST, the rest wait on the lock and find a fresh token inside it.
+        async with self._refresh_lock:
+            if self._token_valid():
+                return True
             return await self.authenticate()
-        return True
 
     async def _get_headers(self) -> Dict[str, str]:
         """Get headers for API requests."""
@@ -302,7 +440,7 @@ class SharePointPhotosApiClient:
                     
                     # Return status and data for successful requests or final attempt
                     if response.status == 200:
-                        data = await response.json()
+                        data = await response.json(loads=json_loads)
                         return response.status, data
                     else:
                         return response.status, {}
@@ -316,8 +454,82 @@ class SharePointPhotosApiClient:
         # This should never be reached, but just in case
         raise Exception("Failed to make authenticated request after all retries")
 
+    async def _make_authenticated_post(
+        self, url: str, json_body: dict, max_retries: int = 1
+    ) -> tuple[int, dict]:
+        """POST with automatic token refresh on 401, mirroring the GET path."""
+        headers = await self._get_headers()
+
+        for attempt in range(max_retries + 1):
+            try:
+                async with self._session.post(url, headers=headers, json=json_body) as response:
+                    if response.status == 401 and attempt < max_retries:
+                        _LOGGER.warning("Got 401 error, refreshing token and retrying (attempt %d/%d)", attempt + 1, max_retries + 1)
+                        self._access_token = None
+                        self._token_expires = None
+                        headers = await self._get_headers()
+                        continue
+
+                    if response.status == 200:
+                        data = await response.json(loads=json_loads)
+                        return response.status, data
+                    return response.status, {}
+
+            except Exception as e:
+                if attempt < max_retries:
+                    _LOGGER.warning("Request failed, retrying (attempt %d/%d): %s", attempt + 1, max_retries + 1, str(e))
+                    continue
+                raise
+
+        raise Exception("Failed to make authenticated request after all retries")
+
+    async def _async_load_stored_ids(self) -> None:
+        """Adopt site/drive IDs discovered by a previous run.
+
+        Both are immutable for a given (site_url, library_name) pair, so
+        persisting them removes two discovery round trips per restart.
+        """
+        self._ids_store_checked = True
+        if self._ids_store is None:
+            return
+
+        try:
+            data = await self._ids_store.async_load()
+        except Exception:
+            _LOGGER.exception("Failed to load stored site/drive IDs")
+            return
+
+        if not data or data.get("key") != self._ids_cache_key():
+            return
+
+        self._site_id = data.get("site_id")
+        self._drive_id = data.get("drive_id")
+        _LOGGER.debug("Reusing stored site/drive IDs")
+
+    async def _async_save_ids(self) -> None:
+        """Persist discovered site/drive IDs for reuse across restarts."""
+        if self._ids_store is None:
+            return
+
+        try:
+            await self._ids_store.async_save(
+                {
+                    "key": self._ids_cache_key(),
+                    "site_id": self._site_id,
+                    "drive_id": self._drive_id,
+                }
+            )
+        except Exception:
+            _LOGGER.exception("Failed to persist site/drive IDs")
+
+    def _ids_cache_key(self) -> str:
+        """Invalidate stored IDs when the site or library is reconfigured."""
+        return f"{self.site_url}|{self.library_name}"
+
     async def _get_site_id(self) -> Optional[str]:
         """Get the SharePoint site ID."""
+        if self._site_id is None and not self._ids_store_checked:
+            await self._async_load_stored_ids()
         if self._site_id:
             return self._site_id
 
@@ -371,32 +583,37 @@ class SharePointPhotosApiClient:
 
             status, data = await self._make_authenticated_request(url)
             if status == 200:
-                _LOGGER.info("Available drives/libraries:")
-                
-                # Log all available drives for debugging
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Available drives/libraries:")
+
+                # One pass builds a case-insensitive lookup table and logs
+                # the available drives for debugging.
+                by_name: Dict[str, str] = {}
                 for drive in data.get("value", []):
                     drive_name = drive.get("name", "")
                     drive_id = drive.get("id", "")
-                    _LOGGER.info("  - Name: '%s', ID: %s", drive_name, drive_id[:20] + "..." if len(drive_id) > 20 else drive_id)
-                    
-                    # Try multiple matching strategies
-                    if (drive_name == self.library_name or 
-                        drive_name == decoded_library_name or
-                        drive_name.lower() == self.library_name.lower() or
-                        drive_name.lower() == decoded_library_name.lower()):
-                        self._drive_id = drive.get("id")
-                        _LOGGER.info("Found matching drive: '%s' with ID: %s", drive_name, self._drive_id[:20] + "..." if len(self._drive_id) > 20 else self._drive_id)
+                    _LOGGER.debug("  - Name: '%s', ID: %.20s...", drive_name, drive_id)
+                    if drive_name:
+                        by_name[drive_name.casefold()] = drive_id
+
+                for candidate in (self.library_name, decoded_library_name):
+                    drive_id = by_name.get(candidate.casefold())
+                    if drive_id:
+                        self._drive_id = drive_id
+                        _LOGGER.info("Found matching drive: '%s' with ID: %.20s...", candidate, drive_id)
+                        await self._async_save_ids()
                         return self._drive_id
-                
+
                 # If no exact match, try partial matching for common variations
-                for drive in data.get("value", []):
-                    drive_name = drive.get("name", "")
-                    if ("document" in drive_name.lower() and "document" in self.library_name.lower()) or \
-                       ("shared" in drive_name.lower() and ("shared" in self.library_name.lower() or "freigegebene" in self.library_name.lower())):
-                        self._drive_id = drive.get("id")
-                        _LOGGER.info("Found partial match drive: '%s' with ID: %s", drive_name, self._drive_id[:20] + "..." if len(self._drive_id) > 20 else self._drive_id)
+                wanted = self.library_name.casefold()
+                for drive_name, drive_id in by_name.items():
+                    if ("document" in drive_name and "document" in wanted) or \
+                       ("shared" in drive_name and ("shared" in wanted or "freigegebene" in wanted)):
+                        self._drive_id = drive_id
+                        _LOGGER.info("Found partial match drive: '%s' with ID: %.20s...", drive_name, drive_id)
+                        await self._async_save_ids()
                         return self._drive_id
-                
+
                 _LOGGER.error("Library '%s' (decoded: '%s') not found in available drives", self.library_name, decoded_library_name)
                 return None
             else:
@@ -422,9 +639,8 @@ class SharePointPhotosApiClient:
             return []
 
         try:
-            _LOGGER.info("Starting recursive folder scan from path: %s", self.base_folder_path)
-            folders = []
-            await self._scan_folders_recursive(drive_id, self.base_folder_path, folders)
+            _LOGGER.info("Starting folder scan from path: %s", self.base_folder_path)
+            folders = await self._scan_photo_folders(drive_id)
             
             # Cache the results for 1 hour
             self._folder_cache = folders
@@ -433,128 +649,198 @@ class SharePointPhotosApiClient:
             _LOGGER.info("Folder scan complete: found %d photo folders", len(folders))
             return folders
 
-        except Exception as e:
-            _LOGGER.error("Error getting photo folders: %s", str(e))
-            import traceback
-            _LOGGER.error("Traceback: %s", traceback.format_exc())
+        except Exception:
+            _LOGGER.exception("Error getting photo folders")
             return []
 
-    async def _scan_folders_recursive(self, drive_id: str, folder_path: str, folders: List[Dict[str, Any]]) -> None:
-        """Recursively scan folders for photos."""
-        _LOGGER.debug("Scanning folder: %s", folder_path)
-        try:
-            headers = await self._get_headers()
-            url = f"{GRAPH_API_BASE}/drives/{drive_id}/root:{folder_path}:/children"
+    async def _scan_photo_folders(self, drive_id: str) -> List[Dict[str, Any]]:
+        """Scan the folder tree breadth-first via Graph $batch requests.
+
+        Packing up to 20 children listings into one POST cuts the HTTP
+        round trips (and the Graph rate-limit spend) by the same factor
+        compared to one request per folder.
+        """
+        folders: List[Dict[str, Any]] = []
+        queue: deque = deque([self.base_folder_path])
+
+        while queue:
+            # Drain the whole frontier into batches and fire them concurrently;
+            # the semaphore in _request_children_batch bounds in-flight POSTs.
+            batches = []
+            while queue:
+                batches.append([queue.popleft() for _ in range(min(len(queue), GRAPH_BATCH_SIZE))])
+
+            batch_results = await asyncio.gather(
+                *(self._request_children_batch(drive_id, paths) for paths in batches),
+                return_exceptions=True,
+            )
 
-            status, data = await self._make_authenticated_request(url)
-            if status == 200:
-                # Count how many photos exist in this folder
-                photo_count = 0
-                subfolders = []
-                
-                items = data.get("value", [])
-                _LOGGER.debug("Found %d items in folder %s", len(items), folder_path)
-                
-                for item in items:
-                    if item.get("folder"):
-                        # It's a subfolder
-                        subfolders.append(item["name"])
-                    elif item.get("file"):
-                        # It's a file, check if it's an image
-                        file_name = item.get("name", "").lower()
-                        if any(file_name.endswith(ext) for ext in IMAGE_EXTENSIONS):
-                            photo_count += 1
-
-                # If current folder meets the minimum threshold, add it to the list
-                if photo_count >= self._min_photos_per_folder:
-                    folders.append({
-                        "name": self._build_display_folder_name(folder_path),
-                        "path": folder_path,
-                        "full_path": folder_path,
-                        "photo_count": photo_count,
-                    })
-                    _LOGGER.debug(
-                        "Added photo folder: %s (%d photos)",
-                        folder_path,
-                        photo_count,
-                    )
-                else:
-                    _LOGGER.debug(
-                        "Skipping folder %s: only %d photos (minimum %d)",
-                        folder_path,
-                        photo_count,
-                        self._min_photos_per_folder,
-                    )
+            for batch_paths, results in zip(batches, batch_results):
+                if isinstance(results, BaseException):
+                    _LOGGER.error("Batch folder request failed: %s", results)
+                    continue
+                for folder_path, (status, data) in zip(batch_paths, results):
+                    if status == 200:
+                        queue.extend(self._classify_folder_items(folder_path, data, folders))
+                    elif status == 404:
+                        _LOGGER.warning("Folder not found: %s", folder_path)
+                    else:
+                        _LOGGER.error("Error scanning folder %s: %s", folder_path, status)
 
-                # Recursively scan subfolders
-                _LOGGER.debug("Scanning %d subfolders in %s", len(subfolders), folder_path)
-                for subfolder in subfolders:
-                    subfolder_path = f"{folder_path}/{subfolder}"
-                    await self._scan_folders_recursive(drive_id, subfolder_path, folders)
+        return folders
 
-            elif status == 404:
-                _LOGGER.warning("Folder not found: %s", folder_path)
-            else:
-                _LOGGER.error("Error scanning folder %s: %s", folder_path, status)
+    async def _request_children_batch(
+        self, drive_id: str, folder_paths: List[str]
+    ) -> List[tuple[int, dict]]:
+        """Fetch children listings for several folders with one $batch POST."""
+        body = {
+            "requests": [
+                {
+                    "id": str(index),
+                    "method": "GET",
+                    "url": f"/drives/{drive_id}/root:{path}:/children?$select=name,folder,file&$top=200",
+                }
+                for index, path in enumerate(folder_paths)
+            ]
+        }
 
-        except Exception as e:
-            _LOGGER.error("Error scanning folder %s: %s", folder_path, str(e))
-            import traceback
-            _LOGGER.error("Traceback: %s", traceback.format_exc())
+        async with self._scan_sem:
+            status, data = await self._make_authenticated_post(f"{GRAPH_API_BASE}/$batch", body)
+        if status != 200:
+            _LOGGER.error("Batch folder request failed: %s", status)
+            return [(status, {}) for _ in folder_paths]
+
+        by_id = {
+            item.get("id"): (item.get("status", 500), item.get("body") or {})
+            for item in data.get("responses", [])
+        }
+        return [by_id.get(str(index), (500, {})) for index in range(len(folder_paths))]
+
+    def _classify_folder_items(
+        self, folder_path: str, data: dict, folders: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Classify one folder's children; returns subfolder paths to scan."""
+        photo_count = 0
+        threshold = self._min_photos_per_folder
+        subfolder_paths: List[str] = []
+
+        items = data.get("value", [])
+        _LOGGER.debug("Found %d items in folder %s", len(items), folder_path)
+
+        for item in items:
+            if item.get("folder"):
+                # It's a subfolder
+                subfolder_paths.append(f"{folder_path}/{item['name']}")
+            elif photo_count < threshold and item.get("file"):
+                # Count images only up to the selection threshold; the exact
+                # total is never used, so stop classifying once it is met.
+                file_name = item.get("name", "").lower()
+                if file_name.endswith(IMAGE_EXTENSIONS_TUPLE):
+                    photo_count += 1
+
+        # If current folder meets the minimum threshold, add it to the list
+        if photo_count >= self._min_photos_per_folder:
+            folders.append({
+                "name": self._build_display_folder_name(folder_path),
+                "path": folder_path,
+                "full_path": folder_path,
+                "photo_count": photo_count,
+            })
+            _LOGGER.debug(
+                "Added photo folder: %s (%d photos)",
+                folder_path,
+                photo_count,
+            )
+        else:
+            _LOGGER.debug(
+                "Skipping folder %s: only %d photos (minimum %d)",
+                folder_path,
+                photo_count,
+                self._min_photos_per_folder,
+            )
 
+        return subfolder_paths
 
-    async def get_folder_photos(self, folder_path: str) -> List[Dict[str, Any]]:
+
+    def _append_photo_item(self, item: Dict[str, Any], photos: List[Photo]) -> None:
+        """Append one DriveItem to the photo list if it is a usable image."""
+        if not item.get("file"):
+            return
+
+        file_name = item.get("name", "").lower()
+        if not file_name.endswith(IMAGE_EXTENSIONS_TUPLE):
+            return
+
+        # Try to get thumbnail URL first (better for browser display)
+        thumbnail_url = next(
+            (
+                ts[size].get("url")
+                for ts in item.get("thumbnails", [])
+                for size in _THUMB_PREFERENCE
+                if size in ts
+            ),
+            None,
+        )
+
+        download_url = item.get("@microsoft.graph.downloadUrl")
+        if not download_url:
+            _LOGGER.warning("No download URL found for photo: %s", item["name"])
+            return
+
+        photo_index = len(photos)
+        display_url = thumbnail_url if thumbnail_url else download_url
+        photos.append(Photo(
+            id=item.get("id"),
+            name=item["name"],
+            url=display_url,
+            proxy_url=f"{self._proxy_url_prefix}/{photo_index}",
+            thumbnail_url=thumbnail_url,
+            download_url=download_url,
+            web_url=item.get("webUrl"),
+            size=item.get("size", 0),
+            modified=item.get("lastModifiedDateTime"),
+            index=photo_index,
+        ))
+        _LOGGER.debug("Added photo: %s (using %s)", item["name"], "thumbnail" if thumbnail_url else "download URL")
+
+    async def get_folder_photos(self, folder_path: str) -> List[Photo]:
         """Get all photos from a specific folder, filtering out broken image URLs."""
         drive_id = await self._get_drive_id()
         if not drive_id:
             return []
 
         try:
-            headers = await self._get_headers()
-            url = f"{GRAPH_API_BASE}/drives/{drive_id}/root:{folder_path}:/children?$expand=thumbnails"
+            url = (
+                f"{GRAPH_API_BASE}/drives/{drive_id}/root:{folder_path}:/children"
+                "?$select=id,name,file,size,lastModifiedDateTime,webUrl,@microsoft.graph.downloadUrl"
+                "&$expand=thumbnails($select=large,medium,small)"
+                "&$top=200"
+            )
 
             photos = []
             status, data = await self._make_authenticated_request(url)
-            if status == 200:
+            while True:
+                if status != 200:
+                    _LOGGER.error("Error getting folder photos: %s", status)
+                    break
+
+                # Graph pages large folders; kick off the next page fetch
+                # before processing this one so network and parsing overlap,
+                # and follow nextLink so folders beyond one page are not
+                # silently truncated.
+                next_link = data.get("@odata.nextLink")
+                next_task = (
+                    asyncio.create_task(self._make_authenticated_request(next_link))
+                    if next_link
+                    else None
+                )
+
                 for item in data.get("value", []):
-                    if item.get("file"):
-                        file_name = item.get("name", "").lower()
-                        if any(file_name.endswith(ext) for ext in IMAGE_EXTENSIONS):
-                            # Try to get thumbnail URL first (better for browser display)
-                            thumbnail_url = None
-                            thumbnails = item.get("thumbnails", [])
-                            if thumbnails:
-                                for thumbnail_set in thumbnails:
-                                    if "large" in thumbnail_set:
-                                        thumbnail_url = thumbnail_set["large"].get("url")
-                                        break
-                                    elif "medium" in thumbnail_set:
-                                        thumbnail_url = thumbnail_set["medium"].get("url")
-                                        break
-                                    elif "small" in thumbnail_set:
-                                        thumbnail_url = thumbnail_set["small"].get("url")
-                                        break
-
-                            download_url = item.get("@microsoft.graph.downloadUrl")
-                            web_url = item.get("webUrl")
-
-                            if download_url:
-                                photo_index = len(photos)
-                                display_url = thumbnail_url if thumbnail_url else download_url
-                                photos.append({
-                                    "name": item["name"],
-                                    "url": display_url,
-                                    "proxy_url": f"/api/sharepoint_photos/image/{{entry_id}}/{photo_index}",
-                                    "thumbnail_url": thumbnail_url,
-                                    "download_url": download_url,
-                                    "web_url": web_url,
-                                    "size": item.get("size", 0),
-                                    "modified": item.get("lastModifiedDateTime"),
-                                    "index": photo_index,
-                                })
-                                _LOGGER.debug("Added photo: %s (using %s)", item["name"], "thumbnail" if thumbnail_url else "download URL")
-                            else:
-                                _LOGGER.warning("No download URL found for photo: %s", item["name"])
+                    self._append_photo_item(item, photos)
+
+                if next_task is None:
+                    break
+                status, data = await next_task
 
             _LOGGER.debug("Found %d valid photos in folder %s", len(photos), folder_path)
             return photos
@@ -638,37 +924,98 @@ class SharePointPhotosApiClient:
             _LOGGER.error("Error selecting folder %s: %s", folder_path, str(e))
             return None
 
-    async def fetch_image_content(self, download_url: str) -> tuple[bytes, str, int]:
-        """Fetch image content from SharePoint with automatic token refresh."""
+    async def fetch_image_stream(
+        self, download_url: str
+    ) -> tuple[int, str, Optional[aiohttp.ClientResponse]]:
+        """Open an image download for chunked streaming without buffering it.
+
+        Returns (status, content_type, response); the caller must consume
+        `response.content` and release the response. On errors the response
+        is already released and None is returned.
+        """
+        try:
+            response = await self._session.get(download_url)
+        except Exception as e:
+            _LOGGER.error("Error opening image stream: %s", str(e))
+            return 500, "", None
+
+        if response.status in (401, 403):
+            _LOGGER.debug("Download URL rejected (%d) while opening stream", response.status)
+            self._access_token = None
+            self._token_expires = None
+            response.release()
+            return response.status, "", None
+
+        if response.status != 200:
+            _LOGGER.error("Failed to open image stream: HTTP %d", response.status)
+            response.release()
+            return response.status, "", None
+
+        header_content_type = response.headers.get("content-type", "")
+        normalized_header_type = header_content_type.split(";", 1)[0].strip().lower()
+        return 200, normalized_header_type, response
+
+    async def fetch_image_content(
+        self,
+        download_url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> tuple[bytes, str, int, Dict[str, Optional[str]]]:
+        """Fetch image content from SharePoint with automatic token refresh.
+
+        When cached validators are supplied they are sent as conditional
+        request headers, so an unchanged image comes back as a cheap 304
+        instead of a full download. Returns the SharePoint validators for
+        the caller to store alongside the cached bytes.
+        """
+        validators: Dict[str, Optional[str]] = {"etag": None, "last_modified": None}
         try:
             # For SharePoint download URLs, we don't need to add our own auth headers
-            # as they contain their own auth tokens. But if they're expired, we need 
+            # as they contain their own auth tokens. But if they're expired, we need
             # to refresh the photo data to get new URLs.
-            async with self._session.get(download_url) as response:
+            request_headers: Dict[str, str] = {}
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if last_modified:
+                request_headers["If-Modified-Since"] = last_modified
+
+            async with self._session.get(download_url, headers=request_headers or None) as response:
+                validators["etag"] = response.headers.get("ETag")
+                validators["last_modified"] = response.headers.get("Last-Modified")
+
+                if response.status == 304:
+                    _LOGGER.debug("Image unchanged upstream (304), cached bytes remain valid")
+                    return b"", "", 304, validators
                 if response.status == 401:
                     _LOGGER.debug("Download URL expired (401), refreshing photo data")
                     # Clear our access token to force re-authentication on next API call
                     self._access_token = None
                     self._token_expires = None
                     # Return the error info so the caller can handle it appropriately
-                    return b"", "", 401
+                    return b"", "", 401, validators
                 elif response.status == 403:
                     _LOGGER.debug("Download URL denied (403), refreshing photo data")
                     self._access_token = None
                     self._token_expires = None
-                    return b"", "", 403
+                    return b"", "", 403, validators
                 elif response.status == 200:
-                    content = await response.read()
+                    # Accumulate in 64KB chunks rather than response.read();
+                    # this keeps peak memory at ~file size instead of letting
+                    # aiohttp buffer the whole body before handing it over.
+                    buffer = bytearray()
+                    async for chunk in response.content.iter_chunked(65536):
+                        buffer += chunk
+                    content = bytes(buffer)
                     header_content_type = response.headers.get("content-type", "")
                     normalized_header_type = header_content_type.split(";", 1)[0].strip().lower()
 
                     if not content:
                         _LOGGER.warning("Empty body for image response, forcing URL refresh")
-                        return b"", "", 403
+                        return b"", "", 403, validators
 
                     if normalized_header_type.startswith("image/"):
                         _LOGGER.debug("Successfully fetched image: %d bytes", len(content))
-                        return content, normalized_header_type, 200
+                        return content, normalized_header_type, 200, validators
 
                     inferred_type = _detect_image_content_type(content)
                     if inferred_type:
@@ -677,7 +1024,7 @@ class SharePointPhotosApiClient:
                             normalized_header_type or "<missing>",
                             inferred_type,
                         )
-                        return content, inferred_type, 200
+                        return content, inferred_type, 200, validators
 
                     preview = content[:80].decode("utf-8", errors="ignore").strip().replace("\n", " ")
                     _LOGGER.warning(
@@ -687,14 +1034,14 @@ class SharePointPhotosApiClient:
                     )
                     self._access_token = None
                     self._token_expires = None
-                    return b"", "", 403
+                    return b"", "", 403, validators
                 else:
                     _LOGGER.error("Failed to fetch image: HTTP %d", response.status)
-                    return b"", "", response.status
+                    return b"", "", response.status, validators
                     
         except Exception as e:
             _LOGGER.error("Error fetching image content: %s", str(e))
-            return b"", "", 500
+            return b"", "", 500, validators
 
     async def test_connection(self) -> bool:
         """Test the connection to SharePoint."""
@@ -714,7 +1061,7 @@ class SharePointPhotosApiClient:
             if not site_id:
                 _LOGGER.error("Failed to get site ID for: %s", self.site_url)
                 return False
-            _LOGGER.info("Site ID found: %s", site_id[:20] + "..." if len(site_id) > 20 else site_id)
+            _LOGGER.info("Site ID found: %.20s...", site_id)
             
             # Step 3: Test library access
             _LOGGER.info("Step 3: Testing library access for: %s", self.library_name)
@@ -722,13 +1069,11 @@ class SharePointPhotosApiClient:
             if not drive_id:
                 _LOGGER.error("Failed to get drive ID for library: %s", self.library_name)
                 return False
-            _LOGGER.info("Drive ID found: %s", drive_id[:20] + "..." if len(drive_id) > 20 else drive_id)
+            _LOGGER.info("Drive ID found: %.20s...", drive_id)
             
             _LOGGER.info("All connection tests passed!")
             return True
             
-        except Exception as e:
-            _LOGGER.error("Connection test failed with exception: %s", str(e))
-            import traceback
-            _LOGGER.error("Traceback: %s", traceback.format_exc())
+        except Exception:
+            _LOGGER.exception("Connection test failed")
             return False
\ No newline at end of file
@@ -3,6 +3,7 @@
 import logging
 from typing import Any, Dict, Optional
 
+import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
@@ -34,6 +35,44 @@ from .const import (
 _LOGGER = logging.getLogger(__name__)
 
 
+def _validate_inputs(user_input: Dict[str, Any]) -> Dict[str, str]:
+    """Cheap field-level checks before any client construction or I/O."""
+    errors: Dict[str, str] = {}
+    if not user_input.get(CONF_SITE_URL, "").startswith("https://"):
+        errors[CONF_SITE_URL] = ERROR_SITE_NOT_FOUND
+    for field in (CONF_TENANT_ID, CONF_CLIENT_ID, CONF_CLIENT_SECRET):
+        if not (user_input.get(field) or "").strip():
+            errors[field] = ERROR_AUTH_FAILED
+    return errors
+
+# Schemas are compiled once at import; building a vol.Schema per form
+# render recompiles the whole validator tree.
+_HISTORY_SELECTOR = vol.All(vol.Coerce(int), vol.Range(min=0, max=200))
+_MIN_PHOTOS_SELECTOR = vol.All(vol.Coerce(int), vol.Range(min=1, max=500))
+_ROTATION_SELECTOR = vol.All(vol.Coerce(int), vol.Range(min=5, max=3600))
+
+_USER_SCHEMA = vol.Schema({
+    vol.Required(CONF_TENANT_ID): str,
+    vol.Required(CONF_CLIENT_ID): str,
+    vol.Required(CONF_CLIENT_SECRET): str,
+    vol.Required(CONF_SITE_URL): str,
+    vol.Optional(CONF_LIBRARY_NAME, default=DEFAULT_LIBRARY_NAME): str,
+    vol.Optional(CONF_BASE_FOLDER_PATH, default=DEFAULT_BASE_FOLDER_PATH): str,
+    vol.Optional(CONF_FOLDER_HISTORY_SIZE, default=DEFAULT_FOLDER_HISTORY_SIZE): _HISTORY_SELECTOR,
+    vol.Optional(CONF_MIN_PHOTO_COUNT, default=DEFAULT_MIN_PHOTO_COUNT): _MIN_PHOTOS_SELECTOR,
+    vol.Optional(CONF_ROTATION_INTERVAL_SECONDS, default=DEFAULT_ROTATION_INTERVAL_SECONDS): _ROTATION_SELECTOR,
+})
+
+_OPTIONS_SCHEMA = vol.Schema({
+    vol.Optional(CONF_CLIENT_SECRET, default=""): str,
+    vol.Optional(CONF_LIBRARY_NAME, default=DEFAULT_LIBRARY_NAME): str,
+    vol.Optional(CONF_BASE_FOLDER_PATH, default=DEFAULT_BASE_FOLDER_PATH): str,
+    vol.Optional(CONF_FOLDER_HISTORY_SIZE, default=DEFAULT_FOLDER_HISTORY_SIZE): _HISTORY_SELECTOR,
+    vol.Optional(CONF_MIN_PHOTO_COUNT, default=DEFAULT_MIN_PHOTO_COUNT): _MIN_PHOTOS_SELECTOR,
+    vol.Optional(CONF_ROTATION_INTERVAL_SECONDS, default=DEFAULT_ROTATION_INTERVAL_SECONDS): _ROTATION_SELECTOR,
+})
+
+
 class SharePointPhotosConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for SharePoint Photos."""
 
@@ -51,7 +90,17 @@ class SharePointPhotosConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             self._user_input.update(user_input)
-            
+
+            # Reject malformed input before paying for client setup and a
+            # network round trip.
+            errors = _validate_inputs(user_input)
+            if errors:
+                return self.async_show_form(
+                    step_id="user",
+                    data_schema=_USER_SCHEMA,
+                    errors=errors,
+                )
+
             # Test the connection
             client = SharePointPhotosApiClient(
                 hass=self.hass,
@@ -68,7 +117,7 @@ class SharePointPhotosConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             try:
                 if await client.test_connection():
                     # Create a unique ID for this config entry
-                    site_id = user_input[CONF_SITE_URL].replace("https://", "").replace("/", "_")
+                    site_id = user_input[CONF_SITE_URL].removeprefix("https://").replace("/", "_")
                     await self.async_set_unique_id(f"{DOMAIN}_{site_id}")
                     self._abort_if_unique_id_configured()
 
@@ -79,8 +128,11 @@ class SharePointPhotosConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 else:
                     errors["base"] = ERROR_AUTH_FAILED
 
+            except (aiohttp.ClientError, TimeoutError):
+                _LOGGER.exception("Network error during setup")
+                errors["base"] = ERROR_NETWORK
             except Exception as e:
-                _LOGGER.error("Unexpected error during setup: %s", str(e))
+                _LOGGER.exception("Unexpected error during setup")
                 if "site" in str(e).lower():
                     errors["base"] = ERROR_SITE_NOT_FOUND
                 else:
@@ -88,26 +140,7 @@ class SharePointPhotosConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema({
-                vol.Required(CONF_TENANT_ID): str,
-                vol.Required(CONF_CLIENT_ID): str,
-                vol.Required(CONF_CLIENT_SECRET): str,
-                vol.Required(CONF_SITE_URL): str,
-                vol.Optional(CONF_LIBRARY_NAME, default=DEFAULT_LIBRARY_NAME): str,
-                vol.Optional(CONF_BASE_FOLDER_PATH, default=DEFAULT_BASE_FOLDER_PATH): str,
-                vol.Optional(
-                    CONF_FOLDER_HISTORY_SIZE,
-                    default=DEFAULT_FOLDER_HISTORY_SIZE
-                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=200)),
-                vol.Optional(
-                    CONF_MIN_PHOTO_COUNT,
-                    default=DEFAULT_MIN_PHOTO_COUNT
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
-                vol.Optional(
-                    CONF_ROTATION_INTERVAL_SECONDS,
-                    default=DEFAULT_ROTATION_INTERVAL_SECONDS,
-                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
-            }),
+            data_schema=_USER_SCHEMA,
             errors=errors,
         )
 
@@ -167,8 +200,11 @@ class SharePointPhotosOptionsFlow(config_entries.OptionsFlow):
                 try:
                     if not await client.authenticate():
                         errors["base"] = ERROR_AUTH_FAILED
-                except Exception as e:
-                    _LOGGER.error("Error testing connection with updated secret: %s", str(e))
+                except (aiohttp.ClientError, TimeoutError):
+                    _LOGGER.exception("Network error testing connection with updated secret")
+                    errors["base"] = ERROR_AUTH_FAILED
+                except Exception:
+                    _LOGGER.exception("Error testing connection with updated secret")
                     errors["base"] = ERROR_AUTH_FAILED
             
             if not errors:
@@ -184,54 +220,22 @@ class SharePointPhotosOptionsFlow(config_entries.OptionsFlow):
 
                 return self.async_create_entry(title="", data=new_options)
 
+        entry_options = self._config_entry.options
+        entry_data = self._config_entry.data
+        suggested = {
+            CONF_CLIENT_SECRET: entry_options.get(CONF_CLIENT_SECRET, ""),
+        }
+        for key, default in (
+            (CONF_LIBRARY_NAME, DEFAULT_LIBRARY_NAME),
+            (CONF_BASE_FOLDER_PATH, DEFAULT_BASE_FOLDER_PATH),
+            (CONF_FOLDER_HISTORY_SIZE, DEFAULT_FOLDER_HISTORY_SIZE),
+            (CONF_MIN_PHOTO_COUNT, DEFAULT_MIN_PHOTO_COUNT),
+            (CONF_ROTATION_INTERVAL_SECONDS, DEFAULT_ROTATION_INTERVAL_SECONDS),
+        ):
+            suggested[key] = entry_options.get(key, entry_data.get(key, default))
+
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema({
-                vol.Optional(
-                    CONF_CLIENT_SECRET,
-                    default=self._config_entry.options.get(
-                        CONF_CLIENT_SECRET,
-                        "",
-                    ),
-                ): str,
-                vol.Optional(
-                    CONF_LIBRARY_NAME,
-                    default=self._config_entry.options.get(
-                        CONF_LIBRARY_NAME, 
-                        self._config_entry.data.get(CONF_LIBRARY_NAME, DEFAULT_LIBRARY_NAME)
-                    ),
-                ): str,
-                vol.Optional(
-                    CONF_BASE_FOLDER_PATH,
-                    default=self._config_entry.options.get(
-                        CONF_BASE_FOLDER_PATH,
-                        self._config_entry.data.get(CONF_BASE_FOLDER_PATH, DEFAULT_BASE_FOLDER_PATH)
-                    ),
-                ): str,
-                vol.Optional(
-                    CONF_FOLDER_HISTORY_SIZE,
-                    default=self._config_entry.options.get(
-                        CONF_FOLDER_HISTORY_SIZE,
-                        self._config_entry.data.get(CONF_FOLDER_HISTORY_SIZE, DEFAULT_FOLDER_HISTORY_SIZE)
-                    ),
-                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=200)),
-                vol.Optional(
-                    CONF_MIN_PHOTO_COUNT,
-                    default=self._config_entry.options.get(
-                        CONF_MIN_PHOTO_COUNT,
-                        self._config_entry.data.get(CONF_MIN_PHOTO_COUNT, DEFAULT_MIN_PHOTO_COUNT)
-                    ),
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
-                vol.Optional(
-                    CONF_ROTATION_INTERVAL_SECONDS,
-                    default=self._config_entry.options.get(
-                        CONF_ROTATION_INTERVAL_SECONDS,
-                        self._config_entry.data.get(
-                            CONF_ROTATION_INTERVAL_SECONDS,
-                            DEFAULT_ROTATION_INTERVAL_SECONDS,
-                        ),
-                    ),
-                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
-            }),
+            data_schema=self.add_suggested_values_to_schema(_OPTIONS_SCHEMA, suggested),
             errors=errors,
         )
\ No newline at end of file
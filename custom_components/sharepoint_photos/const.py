@@ -25,8 +25,8 @@ DEFAULT_ROTATION_INTERVAL_SECONDS = 45
 
 # Microsoft Graph API
 GRAPH_API_BASE = "https://graph.microsoft.com/v1.0"
+GRAPH_BATCH_SIZE = 20  # Maximum requests per $batch call
 AUTHORITY_BASE = "https://login.microsoftonline.com"
-SCOPE = ["https://graph.microsoft.com/.default"]
 
 # Sensor types
 SENSOR_CURRENT_FOLDER = "current_folder"
@@ -44,6 +44,8 @@ UPDATE_INTERVAL_SECONDS = 3600  # 1 hour for checking folder structure changes
 
 # Supported image extensions
 IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff"]
+# Tuple form for str.endswith, which checks all suffixes in one C call
+IMAGE_EXTENSIONS_TUPLE = tuple(IMAGE_EXTENSIONS)
 
 # Error messages
 ERROR_AUTH_FAILED = "authentication_failed"
@@ -2,16 +2,14 @@
 from __future__ import annotations
 
 import logging
-import time
 from datetime import datetime
 from typing import Optional
 
 from homeassistant.components.image import ImageEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
 
@@ -41,34 +39,45 @@ class SharePointPhotosCurrentImage(CoordinatorEntity, ImageEntity):
         if not self.access_tokens:
             self.async_update_token()
         self._config_entry = config_entry
-        site_name = config_entry.data.get("site_url", "").replace("https://", "").replace("/", "_")
-        self._attr_unique_id = f"{DOMAIN}_{site_name}_current_image"
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.site_slug}_current_image"
         self._attr_content_type = "image/jpeg"
+        self._cached_available = self._compute_available()
 
     @property
     def image_last_updated(self) -> datetime | None:
-        """Return the last update time for the image."""
-        interval = (self.coordinator.data or {}).get(
-            "rotation_interval_seconds",
-            getattr(self.coordinator, "rotation_interval_seconds", 10),
-        )
-        cycle_time = max(1, int(interval))
-        current_cycle = int(time.time() / cycle_time)
-        return dt_util.utc_from_timestamp(current_cycle * cycle_time)
+        """Return when the displayed photo actually last changed.
+
+        The coordinator stamps this on every successful photo swap, so
+        the frontend refetches exactly when the bytes change instead of
+        on a wall-clock bucket that may or may not line up with a swap.
+        """
+        return self.coordinator.last_rotation
 
     async def async_image(self) -> Optional[bytes]:
         """Return bytes of image."""
         try:
             content, content_type = await self.coordinator.async_get_or_load_current_image()
-            if content_type:
+            # Only write when the mime type really changed; this runs on
+            # every image fetch and almost always yields the same value.
+            if content_type and content_type != self._attr_content_type:
                 self._attr_content_type = content_type
             return content
         except Exception as e:
             _LOGGER.error("Unexpected error in async_image: %s", e)
             return None
 
+    def _compute_available(self) -> bool:
+        """Availability: a fresh update, or a photo we can still serve."""
+        data = self.coordinator.data or {}
+        return self.coordinator.last_update_success or bool(data.get("current_photo_name"))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Refresh the cached availability flag on new data."""
+        self._cached_available = self._compute_available()
+        super()._handle_coordinator_update()
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        data = self.coordinator.data or {}
-        return self.coordinator.last_update_success or bool(data.get("current_photo_name"))
+        return self._cached_available
@@ -1,6 +1,5 @@
 """Sensor platform for SharePoint Photos integration."""
 
-import asyncio
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
@@ -10,9 +9,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.util import dt as dt_util
-from datetime import timedelta
 
 from .const import (
     DOMAIN,
@@ -26,13 +23,27 @@ from .const import (
 _LOGGER = logging.getLogger(__name__)
 
 
-def _select_photo_url(photo: Dict[str, Any]) -> Optional[str]:
-    """Return the most reliable URL for a photo (proxy first)."""
-    for key in ("proxy_url", "url", "thumbnail_url", "download_url", "web_url"):
-        url = photo.get(key)
-        if url:
-            return url
-    return None
+def _last_updated_value(data: Dict[str, Any]) -> Optional[datetime]:
+    """Parse the payload's ISO timestamp for the timestamp sensor."""
+    timestamp_str = data.get("last_updated")
+    if not timestamp_str:
+        return None
+    try:
+        return dt_util.parse_datetime(timestamp_str)
+    except (ValueError, TypeError):
+        _LOGGER.warning("Invalid timestamp format: %s", timestamp_str)
+        return None
+
+
+# Per-key state getters, bound once per sensor at construction instead of
+# walking an if/elif chain on every state read.
+_VALUE_GETTERS = {
+    SENSOR_CURRENT_FOLDER: lambda data: data.get("folder_name"),
+    SENSOR_PHOTO_COUNT: lambda data: data.get("photo_count", 0),
+    SENSOR_FOLDER_PATH: lambda data: data.get("folder_path"),
+    SENSOR_LAST_UPDATED: _last_updated_value,
+    SENSOR_CURRENT_PICTURE: lambda data: data.get("current_proxy_url"),
+}
 
 
 SENSOR_DESCRIPTIONS = [
@@ -98,41 +109,28 @@ class SharePointPhotosSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self.entity_description = description
         self._config_entry = config_entry
+        self._value_getter = _VALUE_GETTERS[description.key]
+        
+        # Cached attributes for the current coordinator payload
+        self._attr_cache: Optional[Dict[str, Any]] = None
+        self._cached_available = bool(coordinator.last_update_success and coordinator.data)
         
         # Generate unique entity ID
-        site_name = config_entry.data.get("site_url", "").replace("https://", "").replace("/", "_")
-        self._attr_unique_id = f"{DOMAIN}_{site_name}_{description.key}"
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.site_slug}_{description.key}"
         self._attr_name = f"SharePoint Photos {description.name}"
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop the cached attributes when new data arrives."""
+        self._attr_cache = None
+        self._cached_available = bool(self.coordinator.last_update_success and self.coordinator.data)
+        super()._handle_coordinator_update()
+
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-
         data = self.coordinator.data
-
-        if self.entity_description.key == SENSOR_CURRENT_FOLDER:
-            return data.get("folder_name")
-        elif self.entity_description.key == SENSOR_PHOTO_COUNT:
-            return data.get("photo_count", 0)
-        elif self.entity_description.key == SENSOR_FOLDER_PATH:
-            return data.get("folder_path")
-        elif self.entity_description.key == SENSOR_LAST_UPDATED:
-            # Convert ISO string to datetime object for timestamp sensor
-            timestamp_str = data.get("last_updated")
-            if timestamp_str:
-                try:
-                    # Parse ISO format string to datetime
-                    return dt_util.parse_datetime(timestamp_str)
-                except (ValueError, TypeError):
-                    _LOGGER.warning("Invalid timestamp format: %s", timestamp_str)
-                    return None
-            return None
-        elif self.entity_description.key == SENSOR_CURRENT_PICTURE:
-            return data.get("current_proxy_url")
-        
-        return None
+        return self._value_getter(data) if data else None
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
@@ -143,43 +141,49 @@ class SharePointPhotosSensor(CoordinatorEntity, SensorEntity):
         data = self.coordinator.data
         
         if self.entity_description.key == SENSOR_CURRENT_FOLDER:
+            # HA reads attributes far more often than the data changes;
+            # rebuild the dict only after a coordinator update.
+            if self._attr_cache is not None:
+                return self._attr_cache
+
             # For the main folder sensor, include compact metadata for the stable current image.
-            photos = data.get("photos", [])
-            photo_urls = [_select_photo_url(photo) for photo in photos]
-            photo_urls = [url for url in photo_urls if url]
+            rot = data.get("rot", {})
+            names = rot.get("names", ())
+            photo_urls = data.get("photo_urls", ())
 
             current_picture_url = data.get("current_proxy_url")
-            current_photo = None
             preview_urls: List[str] = []
 
             current_index = data.get("current_photo_index")
-            if current_index is not None and photos and 0 <= current_index < len(photos):
-                current_photo = photos[current_index]
+            has_current = current_index is not None and 0 <= current_index < len(names)
 
             if photo_urls:
-                preview_urls = photo_urls[:5]  # keep attributes compact for recorder
+                preview_urls = list(photo_urls[:5])  # keep attributes compact for recorder
 
+            current_name = names[current_index] if has_current else None
             attributes: Dict[str, Any] = {
                 "folder_path": data.get("folder_path"),
-                "photo_count": len(photos),
+                "photo_count": len(names),
                 "rotation_cycle_seconds": data.get("rotation_interval_seconds"),
                 "current_picture_url": current_picture_url,
-                "current_picture_label": current_photo.get("name") if current_photo else None,
+                "current_picture_label": current_name,
             }
 
             if preview_urls:
                 attributes["preview_urls"] = preview_urls
 
-            if current_photo:
-                attributes["current_photo_id"] = current_photo.get("id")
-                attributes["current_photo_name"] = current_photo.get("name")
-                if current_photo.get("web_url"):
-                    attributes["current_photo_web_url"] = current_photo["web_url"]
+            if has_current:
+                attributes["current_photo_id"] = rot.get("ids", ())[current_index]
+                attributes["current_photo_name"] = current_name
+                web_url = rot.get("web_urls", ())[current_index]
+                if web_url:
+                    attributes["current_photo_web_url"] = web_url
 
             recent_folders = data.get("recent_folders")
             if recent_folders:
                 attributes["recent_folders"] = recent_folders
 
+            self._attr_cache = attributes
             return attributes
         
         return {}
@@ -200,7 +204,7 @@ class SharePointPhotosSensor(CoordinatorEntity, SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success and self.coordinator.data is not None
+        return self._cached_available
 
 
 class SharePointPhotosRotatingSensor(CoordinatorEntity, SensorEntity):
@@ -216,27 +220,20 @@ class SharePointPhotosRotatingSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self.entity_description = description
         self._config_entry = config_entry
-        self._update_timer = None
+        # Cached attributes for the current coordinator payload
+        self._attr_cache: Optional[Dict[str, Any]] = None
+        self._cached_available = bool(coordinator.last_update_success and coordinator.data)
         
         # Generate unique entity ID
-        site_name = config_entry.data.get("site_url", "").replace("https://", "").replace("/", "_")
-        self._attr_unique_id = f"{DOMAIN}_{site_name}_{description.key}"
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.site_slug}_{description.key}"
         self._attr_name = f"SharePoint Photos {description.name}"
 
-    async def async_added_to_hass(self) -> None:
-        """Run when entity is added to hass."""
-        await super().async_added_to_hass()
-
-    async def async_will_remove_from_hass(self) -> None:
-        """Run when entity is removed from hass."""
-        if self._update_timer:
-            self._update_timer()
-        await super().async_will_remove_from_hass()
-
     @callback
-    def _async_update_state(self, now=None) -> None:
-        """Update the state of the sensor."""
-        self.async_write_ha_state()
+    def _handle_coordinator_update(self) -> None:
+        """Drop the cached attributes when new data arrives."""
+        self._attr_cache = None
+        self._cached_available = bool(self.coordinator.last_update_success and self.coordinator.data)
+        super()._handle_coordinator_update()
 
     @property
     def native_value(self) -> Any:
@@ -253,36 +250,42 @@ class SharePointPhotosRotatingSensor(CoordinatorEntity, SensorEntity):
         if not self.coordinator.data:
             return {}
 
+        if self._attr_cache is not None:
+            return self._attr_cache
+
         data = self.coordinator.data
-        photos = data.get("photos", [])
-        photo_urls = [_select_photo_url(photo) for photo in photos]
-        photo_urls = [url for url in photo_urls if url]
+        rot = data.get("rot", {})
+        names = rot.get("names", ())
+        photo_urls = data.get("photo_urls", ())
 
         current_index = data.get("current_photo_index") or 0
-        current_photo = photos[current_index] if photos and current_index < len(photos) else None
+        has_current = bool(names) and current_index < len(names)
+        current_name = names[current_index] if has_current else None
         current_proxy_url = data.get("current_proxy_url")
         
         attributes = {
             "total_photos": len(photo_urls),
             "current_index": current_index + 1,  # 1-based for display
             "current_photo_url": current_proxy_url,
-            "current_photo_name": current_photo.get("name") if current_photo else None,
-            "current_photo_label": f"Photo {current_index + 1}: {current_photo.get('name')}" if current_photo else None,
+            "current_photo_name": current_name,
+            "current_photo_label": f"Photo {current_index + 1}: {current_name}" if has_current else None,
             "cycle_time_seconds": data.get("rotation_interval_seconds"),
             "folder_name": data.get("folder_name"),
         }
         
         # Add thumbnail and alternative URLs if available
-        if current_photo:
-            if current_photo.get("proxy_url"):
-                attributes["current_photo_proxy_url"] = current_photo["proxy_url"]
-            if current_photo.get("thumbnail_url"):
-                attributes["current_photo_thumbnail"] = current_photo["thumbnail_url"]
-            if current_photo.get("download_url"):
-                attributes["current_photo_download_url"] = current_photo["download_url"]
-            if current_photo.get("web_url"):
-                attributes["current_photo_web_url"] = current_photo["web_url"]
+        if has_current:
+            for attr_key, column in (
+                ("current_photo_proxy_url", "proxies"),
+                ("current_photo_thumbnail", "thumbs"),
+                ("current_photo_download_url", "downloads"),
+                ("current_photo_web_url", "web_urls"),
+            ):
+                value = rot.get(column, ())[current_index]
+                if value:
+                    attributes[attr_key] = value
         
+        self._attr_cache = attributes
         return attributes
 
     @property
@@ -300,4 +303,4 @@ class SharePointPhotosRotatingSensor(CoordinatorEntity, SensorEntity):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success and self.coordinator.data is not None
\ No newline at end of file
+        return self._cached_available
\ No newline at end of file